@@ -7,23 +7,44 @@ import binascii
 import colorsys
 import io
 import os
+import shutil
+import subprocess
 import sys
-import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 try:
-    from PIL import Image
+    from PIL import Image, features
     PIL_AVAILABLE = True
 except ImportError:
     PIL_AVAILABLE = False
 
+try:
+    import mozjpeg_lossless_optimization  # type: ignore
+    MOZJPEG_AVAILABLE = True
+except ImportError:
+    MOZJPEG_AVAILABLE = False
+
+# Official Pillow wheels link libjpeg-turbo, whose SIMD DCT / colour
+# conversion / Huffman kernels make each JPEG encode several times faster
+# than stock libjpeg. Warn loudly if we are running against a build without it.
+if PIL_AVAILABLE and not features.check_feature("libjpeg_turbo"):
+    print(
+        "Warning: Pillow is not linked against libjpeg-turbo — artwork JPEG "
+        "encoding will be slow. Reinstall Pillow from the official wheels.",
+        file=sys.stderr,
+        flush=True,
+    )
+
 from model_provider import AIProvider
+from http_client import http_get_bytes
 from config import (
     DEFAULT_ARTWORK_PROMPT_FILE,
     OPENAI_IMAGE_MODEL,
     OPENAI_IMAGE_QUALITY,
     OPENAI_IMAGE_SIZE,
     SPOTIFY_PLAYLIST_IMAGE_MAX_BYTES,
+    SPOTIFY_PLAYLIST_IMAGE_MAX_DIMENSION,
     read_file_if_exists,
 )
 
@@ -37,6 +58,18 @@ _FALLBACK_FONTS = [
     "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
 ]
 
+# Lowest JPEG quality tried when compressing artwork for upload
+_MIN_JPEG_QUALITY = 60
+_JPEG_MAGIC = b"\xff\xd8\xff"
+# libjpeg-turbo's jpegtran rewrites JPEGs losslessly when mozjpeg isn't installed
+_JPEGTRAN = shutil.which("jpegtran")
+# Lossless rewrites save roughly 5-20%, so only try them when that could fit
+_LOSSLESS_MAX_OVERSHOOT = 1.25
+
+# Background worker for artwork jobs. Pillow releases the GIL inside its
+# encoders, so a plain thread overlaps image work with the caller's I/O.
+_ARTWORK_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="artwork")
+
 
 def _default_artwork_prompt_template() -> str:
     """Fallback prompt for playlist artwork generation."""
@@ -64,17 +97,16 @@ def _build_artwork_prompt(
 
     # If template has placeholders, format them; otherwise use as-is
     if "{" in template and "}" in template:
-        artist_names = ", ".join(
-            dict.fromkeys(
-                [a.get("name", "") for a in top_artists if a.get("name")]
-                + [
-                    artist.get("name", "")
-                    for track in top_tracks
-                    for artist in track.get("artists", [])
-                    if artist.get("name")
-                ]
-            )
-        )
+        # Ordered de-dupe of top artists followed by track artists, in one pass
+        seen_artists: dict[str, None] = {}
+        for artist in top_artists:
+            if artist.get("name"):
+                seen_artists.setdefault(artist["name"], None)
+        for track in top_tracks:
+            for artist in track.get("artists", []):
+                if artist.get("name"):
+                    seen_artists.setdefault(artist["name"], None)
+        artist_names = ", ".join(seen_artists)
         track_names = ", ".join(
             track.get("name", "") for track in top_tracks[:12] if track.get("name")
         )
@@ -270,8 +302,14 @@ def _render_text_overlay(
         return image_bytes
 
 
-def _extract_base64_image(response: dict[str, Any]) -> str | None:
-    """Extract base64 image data from an OpenAI-compatible image response."""
+def _extract_image(response: dict[str, Any]) -> tuple[bytes, str | None] | None:
+    """Extract raw image bytes from an OpenAI-compatible image response.
+
+    Returns (image_bytes, source_b64), where source_b64 is the provider's
+    base64 payload when the image arrived inline (None for URL downloads),
+    or None if the response carries no image. Raises binascii.Error or
+    ValueError if an inline payload is not valid base64.
+    """
     data = response.get("data")
     if not isinstance(data, list) or not data:
         return None
@@ -282,14 +320,13 @@ def _extract_base64_image(response: dict[str, Any]) -> str | None:
 
     b64_json = first.get("b64_json")
     if isinstance(b64_json, str) and b64_json.strip():
-        return b64_json.strip()
+        source_b64 = b64_json.strip()
+        return base64.b64decode(source_b64, validate=True), source_b64
 
     image_url = first.get("url")
     if isinstance(image_url, str) and image_url.strip():
         try:
-            with urllib.request.urlopen(image_url) as resp:
-                raw = resp.read()
-            return base64.b64encode(raw).decode("ascii")
+            return http_get_bytes(image_url), None
         except Exception as exc:
             print(f"  Artwork fetch failed: {exc}", file=sys.stderr, flush=True)
             return None
@@ -297,49 +334,164 @@ def _extract_base64_image(response: dict[str, Any]) -> str | None:
     return None
 
 
+def _encode_jpeg(img: Any, quality: int, out: io.BytesIO) -> int:
+    """Encode an RGB image into `out` as an optimized progressive JPEG.
+
+    `out` is rewound and truncated first so one buffer can be reused across
+    attempts. Returns the encoded size in bytes.
+    """
+    out.seek(0)
+    out.truncate()
+    img.save(
+        out,
+        format="JPEG",
+        quality=quality,
+        optimize=True,
+        progressive=True,
+        subsampling="4:2:0",
+    )
+    return out.tell()
+
+
+def _optimize_jpeg_losslessly(jpeg_bytes: bytes) -> bytes | None:
+    """Shrink a JPEG without re-encoding it (entropy coding rewrite only).
+
+    Uses mozjpeg-lossless-optimization when installed, else `jpegtran` from
+    PATH. Returns None if neither is available or the rewrite fails.
+    """
+    try:
+        if MOZJPEG_AVAILABLE:
+            return mozjpeg_lossless_optimization.optimize(jpeg_bytes)
+        if _JPEGTRAN:
+            result = subprocess.run(
+                [_JPEGTRAN, "-copy", "none", "-optimize", "-progressive"],
+                input=jpeg_bytes,
+                capture_output=True,
+                check=True,
+                timeout=30,
+            )
+            return result.stdout or None
+    except Exception as err:
+        print(f"  Lossless JPEG optimization failed: {err}", file=sys.stderr, flush=True)
+    return None
+
+
 def _compress_image_if_needed(
     image_bytes: bytes,
     max_bytes: int = SPOTIFY_PLAYLIST_IMAGE_MAX_BYTES,
     target_quality: int = 95,
 ) -> bytes:
-    """Compress JPEG image to fit within Spotify's size limit if needed."""
-    if len(image_bytes) <= max_bytes:
+    """Return a JPEG that fits within Spotify's size limit.
+
+    JPEG input already within the limit is returned untouched without
+    invoking Pillow. Anything else (oversized JPEG, or PNG and other
+    formats of any size, since Spotify covers must be JPEG) is re-encoded.
+    """
+    is_jpeg = image_bytes[:3] == _JPEG_MAGIC
+    if is_jpeg and len(image_bytes) <= max_bytes:
         return image_bytes
 
+    # An oversized JPEG may fit after a lossless rewrite, which skips the
+    # decode, colour conversion and DCT of a full re-encode.
+    if is_jpeg and len(image_bytes) <= max_bytes * _LOSSLESS_MAX_OVERSHOOT:
+        optimized = _optimize_jpeg_losslessly(image_bytes)
+        if optimized and len(optimized) <= max_bytes:
+            print(
+                f"  Losslessly optimized artwork: {len(image_bytes)} → "
+                f"{len(optimized)} bytes",
+                file=sys.stderr,
+                flush=True,
+            )
+            return optimized
+
     if not PIL_AVAILABLE:
-        print(
-            f"  Image too large ({len(image_bytes)} bytes) and PIL not available. "
-            f"Install Pillow to compress: pip install Pillow",
-            file=sys.stderr,
-            flush=True,
-        )
+        if len(image_bytes) > max_bytes:
+            print(
+                f"  Image too large ({len(image_bytes)} bytes) and PIL not available. "
+                f"Install Pillow to compress: pip install Pillow",
+                file=sys.stderr,
+                flush=True,
+            )
+        elif not is_jpeg:
+            print(
+                "  Image is not a JPEG and PIL is not available to convert it; "
+                "Spotify may reject the upload. Install Pillow: pip install Pillow",
+                file=sys.stderr,
+                flush=True,
+            )
         return image_bytes
 
     try:
+        max_dimension = SPOTIFY_PLAYLIST_IMAGE_MAX_DIMENSION
         img = Image.open(io.BytesIO(image_bytes))
+        # Let the JPEG decoder do DCT-domain downscaling where it can
+        img.draft("RGB", (max_dimension, max_dimension))
+        if img.mode == "P":
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
         if img.mode in ("RGBA", "LA"):
-            # Convert RGBA to RGB for JPEG
-            rgb_img = Image.new("RGB", img.size, (255, 255, 255))
-            rgb_img.paste(img, mask=img.split()[3] if img.mode == "RGBA" else img.split()[1])
-            img = rgb_img
-
-        # Fine-grained quality reduction for precise compression targeting
-        quality = target_quality
-        while quality >= 60:
-            compressed_io = io.BytesIO()
-            img.save(compressed_io, format="JPEG", quality=quality, optimize=True)
-            compressed_bytes = compressed_io.getvalue()
-
-            if len(compressed_bytes) <= max_bytes:
-                print(
-                    f"  Compressed artwork: {len(image_bytes)} → "
-                    f"{len(compressed_bytes)} bytes (quality: {quality})",
-                    file=sys.stderr,
-                    flush=True,
-                )
-                return compressed_bytes
-
-            quality -= 2
+            # Flatten onto white for JPEG in a single blend pass
+            if img.mode == "LA":
+                img = img.convert("RGBA")
+            background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+            img = Image.alpha_composite(background, img).convert("RGB")
+        elif img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+
+        # Spotify never displays covers above max_dimension; shrinking first
+        # cuts the number of blocks to encode and usually fits at top quality.
+        if max(img.size) > max_dimension:
+            img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+        # Encoded size is monotone in quality, so bisect the quality grid
+        # for the highest setting that fits instead of stepping down linearly.
+        # Downscaled artwork normally fits at the top, so probe there first.
+        qualities = list(range(target_quality, _MIN_JPEG_QUALITY - 1, -2))[::-1]
+        lo, hi = 0, len(qualities) - 1
+        mid = hi
+        best: tuple[int, bytes] | None = None
+
+        # One buffer serves every attempt; bytes are only copied out of it
+        # for an encode that fits.
+        with io.BytesIO() as compressed_io:
+            while lo <= hi:
+                size = _encode_jpeg(img, qualities[mid], compressed_io)
+                compressed_bytes: bytes | None = None
+                if (
+                    MOZJPEG_AVAILABLE
+                    and max_bytes < size <= max_bytes * _LOSSLESS_MAX_OVERSHOOT
+                    and mid == len(qualities) - 1
+                ):
+                    # Lossless pass on the top-quality encode before giving
+                    # up quality (and paying for full re-encodes) for size.
+                    # Our encode is already optimized and progressive, so
+                    # only mozjpeg's scan optimization has anything left to
+                    # win; a jpegtran subprocess here would be wasted.
+                    compressed_bytes = _optimize_jpeg_losslessly(
+                        compressed_io.getvalue(),
+                    )
+                    if compressed_bytes is not None:
+                        size = len(compressed_bytes)
+
+                if size <= max_bytes:
+                    if compressed_bytes is None:
+                        with compressed_io.getbuffer() as view:
+                            compressed_bytes = bytes(view)
+                    best = (qualities[mid], compressed_bytes)
+                    lo = mid + 1
+                else:
+                    hi = mid - 1
+                mid = (lo + hi) // 2
+
+        if best is not None:
+            quality, compressed_bytes = best
+            print(
+                f"  {'Compressed' if is_jpeg else 'Transcoded'} artwork to JPEG: "
+                f"{len(image_bytes)} → "
+                f"{len(compressed_bytes)} bytes (quality: {quality})",
+                file=sys.stderr,
+                flush=True,
+            )
+            return compressed_bytes
 
         print(
             f"  Image compression failed: could not get below {max_bytes} bytes. "
@@ -391,16 +543,17 @@ def generate_playlist_artwork_base64(
         print(f"  Artwork AI failed: {exc}", file=sys.stderr, flush=True)
         return None
 
-    image_b64 = _extract_base64_image(response)
-    if not image_b64:
-        print("  Artwork AI returned no image payload.", file=sys.stderr, flush=True)
-        return None
-
     try:
-        image_bytes = base64.b64decode(image_b64, validate=True)
+        extracted = _extract_image(response)
     except (binascii.Error, ValueError):
         print("  Artwork payload was not valid base64.", file=sys.stderr, flush=True)
         return None
+    if not extracted or not extracted[0]:
+        print("  Artwork AI returned no image payload.", file=sys.stderr, flush=True)
+        return None
+
+    source_bytes, source_b64 = extracted
+    image_bytes = source_bytes
 
     # Render text overlay via Pillow (guarantees zero shadow, exact positioning)
     image_bytes = _render_text_overlay(image_bytes, playlist_name)
@@ -418,4 +571,34 @@ def generate_playlist_artwork_base64(
         )
         return None
 
+    # Untouched inline payload: reuse the provider's base64 as-is
+    if image_bytes is source_bytes and source_b64:
+        return source_b64
+
+    # Encode exactly once, on the final bytes
     return base64.b64encode(image_bytes).decode("ascii")
+
+
+def generate_playlist_artwork_base64_async(
+    provider: AIProvider,
+    top_tracks: list[dict[str, Any]],
+    top_artists: list[dict[str, Any]],
+    *,
+    source_week: str,
+    target_week: str,
+    playlist_name: str = "Weekly Playlist",
+) -> Future[str | None]:
+    """Start generate_playlist_artwork_base64 on a background thread.
+
+    Returns a Future resolving to the same result, so the caller can carry
+    on with other Spotify/OpenAI calls while the image is generated.
+    """
+    return _ARTWORK_EXECUTOR.submit(
+        generate_playlist_artwork_base64,
+        provider,
+        top_tracks,
+        top_artists,
+        source_week=source_week,
+        target_week=target_week,
+        playlist_name=playlist_name,
+    )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 import sys
 from pathlib import Path
@@ -11,6 +12,8 @@ SPOTIFY_ACCOUNTS_BASE = "https://accounts.spotify.com"
 SPOTIFY_API_BASE = "https://api.spotify.com/v1"
 SPOTIFY_PLAYLIST_DESCRIPTION_MAX = 300
 SPOTIFY_PLAYLIST_IMAGE_MAX_BYTES = 256 * 1024
+SPOTIFY_PLAYLIST_IMAGE_MAX_DIMENSION = 640  # Covers are never shown larger
+SPOTIFY_SEARCH_MAX_WORKERS = 6  # Concurrent searches, kept under rate limits
 
 # ── OpenAI API ──────────────────────────────────────────────────
 OPENAI_API_BASE_URL = "https://api.openai.com/v1"
@@ -29,6 +32,16 @@ DEFAULT_USER_PROMPT_FILE = "prompts/playlist_description_prompt.md"
 DEFAULT_RECOMMENDATIONS_PROMPT_FILE = "prompts/recommendations_prompt.md"
 DEFAULT_ARTWORK_PROMPT_FILE = "prompts/playlist_artwork_prompt.md"
 
+# ── Local cache ─────────────────────────────────────────────────────
+CACHE_DIR = (
+    Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "build-weekly-spotify-playlist"
+)
+SPOTIFY_TOKEN_CACHE_FILE = CACHE_DIR / "token.json"
+SPOTIFY_TOKEN_EXPIRY_MARGIN_SECONDS = 60  # Refresh this long before expiry
+TRACK_CACHE_FILE = CACHE_DIR / "track_artist.sqlite"
+TRACK_CACHE_TTL_DAYS = 180  # A track's primary artist practically never changes
+
 # ── Retry config ────────────────────────────────────────────────────
 MAX_RETRIES = 10  # Increased for rate limit tolerance
 RETRY_BACKOFF = 2.0  # seconds
@@ -44,9 +57,20 @@ def require_env(name: str) -> str:
     return value
 
 
+@functools.lru_cache(maxsize=32)
+def _read_text_cached(path: str, mtime_ns: int) -> str:
+    """Read a text file; cached per (path, mtime) so edits are picked up."""
+    return Path(path).read_text(encoding="utf-8")
+
+
 def read_file_if_exists(path: str) -> str | None:
-    """Read a text file if it exists, else return None."""
-    file_path = Path(path)
-    if not file_path.exists():
+    """Read a text file if it exists, else return None.
+
+    Contents are cached, so repeated reads of an unchanged prompt file cost
+    a single stat() rather than a full read and decode.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
         return None
-    return file_path.read_text(encoding="utf-8")
+    return _read_text_cached(path, mtime_ns)
@@ -11,6 +11,7 @@ import os
 import sys
 import urllib.error
 from collections import deque
+from concurrent.futures import Future
 
 from model_provider_openai import OpenAIProvider
 from config import (
@@ -21,7 +22,7 @@ from config import (
     require_env,
 )
 from multi_user_config import load_users_from_env
-from artwork import generate_playlist_artwork_base64
+from artwork import generate_playlist_artwork_base64_async
 from spotify_auth import spotify_access_token
 from spotify_api import (
     artists_from_tracks,
@@ -84,6 +85,21 @@ def _spread_tracks_by_artist(
     return ordered
 
 
+def _discard_artwork(artwork_future: Future[str | None]) -> None:
+    """Cancel an artwork job the run no longer needs, or wait it out."""
+    if artwork_future.cancel():
+        return
+    print("Discarding in-progress playlist artwork…", file=sys.stderr, flush=True)
+    try:
+        artwork_future.result()
+    except Exception as err:
+        print(
+            f"  ⚠ Discarded artwork generation failed: {err}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
 def create_playlist_for_user(
     username: str,
     spotify_client_id: str,
@@ -231,6 +247,8 @@ def create_playlist_for_user(
         flush=True,
     )
 
+    playlist_name = target_week
+
     # ── Build discovery mix ─────────────────────────────────────────
     print("Building discovery track mix…", flush=True)
     primary_artist_by_uri: dict[str, str] = {}
@@ -279,8 +297,6 @@ def create_playlist_for_user(
     playlist_description = assemble_final_description(playlist_description)
 
     # ── Create or overwrite playlist ────────────────────────────────
-    playlist_name = target_week
-
     if existing_playlist_id:
         print("Overwriting existing playlist…", flush=True)
         removed = spotify_clear_playlist(token, existing_playlist_id)
@@ -311,96 +327,110 @@ def create_playlist_for_user(
                 )
             raise
 
-    # ── Add tracks (final dedupe) ────────────────────────────────────
-    seen: set[str] = set()
-    unique_uris: list[str] = []
-    for uri in rec_uris:
-        if uri not in seen:
-            seen.add(uri)
-            unique_uris.append(uri)
-    rec_uris = unique_uris[:100]
-
-    if primary_artist_by_uri:
-        rec_uris = _spread_tracks_by_artist(rec_uris, primary_artist_by_uri)
-
-    added_count = spotify_add_tracks(token, playlist_id, rec_uris)
-    if added_count == 0:
-        print(
-            "No source/discovery tracks could be added; "
-            "falling back to current top tracks.",
-            file=sys.stderr,
-            flush=True,
-        )
-        top_track_uris = [
-            track["uri"]
-            for track in current_top_tracks
-            if track.get("uri")
-        ]
-        top_track_uris = list(dict.fromkeys(top_track_uris))
-        added_count = spotify_add_tracks(token, playlist_id, top_track_uris)
-        rec_uris = top_track_uris
-
-    if added_count == 0:
-        print(
-            "No tracks could be added to the playlist.",
-            file=sys.stderr,
-            flush=True,
+    # ── Start artwork in the background ─────────────────────────────
+    # Image generation is the slowest call in the run. Start it only once
+    # the playlist exists, so a run that fails earlier never pays for it,
+    # and let it overlap adding the tracks.
+    artwork_future: Future[str | None] | None = None
+    if artwork_enabled:
+        print("Generating playlist artwork with AI (background)…", flush=True)
+        artwork_future = generate_playlist_artwork_base64_async(
+            provider,
+            source_tracks,
+            source_artists,
+            source_week=source_week,
+            target_week=target_week,
+            playlist_name=playlist_name,
         )
-        sys.exit(1)
 
-    # ── Generate/upload playlist artwork ──────────────────────────
-    if artwork_enabled:
-        print("Generating playlist artwork with AI…", flush=True)
-        try:
-            artwork_b64 = generate_playlist_artwork_base64(
-                provider,
-                source_tracks,
-                source_artists,
-                source_week=source_week,
-                target_week=target_week,
-                playlist_name=playlist_name,
+    try:
+        # ── Add tracks (final dedupe) ────────────────────────────────────
+        seen: set[str] = set()
+        unique_uris: list[str] = []
+        for uri in rec_uris:
+            if uri not in seen:
+                seen.add(uri)
+                unique_uris.append(uri)
+        rec_uris = unique_uris[:100]
+
+        if primary_artist_by_uri:
+            rec_uris = _spread_tracks_by_artist(rec_uris, primary_artist_by_uri)
+
+        added_count = spotify_add_tracks(token, playlist_id, rec_uris)
+        if added_count == 0:
+            print(
+                "No source/discovery tracks could be added; "
+                "falling back to current top tracks.",
+                file=sys.stderr,
+                flush=True,
             )
-            if artwork_b64:
-                try:
-                    spotify_upload_playlist_cover_image(
-                        token,
-                        playlist_id,
-                        artwork_b64,
-                    )
-                    print("  Uploaded custom playlist artwork.", flush=True)
-                except urllib.error.HTTPError as err:
-                    if err.code == 403:
-                        print(
-                            "  Artwork upload forbidden (403). "
-                            "Check ownership and ugc-image-upload scope.",
-                            file=sys.stderr,
-                            flush=True,
-                        )
-                    elif err.code == 429:
-                        print(
-                            "  Artwork upload rate limited (429). "
-                            "Skipping for now.",
-                            file=sys.stderr,
-                            flush=True,
-                        )
-                    else:
-                        print(
-                            f"  Artwork upload failed ({err}).",
-                            file=sys.stderr,
-                            flush=True,
+            top_track_uris = [
+                track["uri"]
+                for track in current_top_tracks
+                if track.get("uri")
+            ]
+            top_track_uris = list(dict.fromkeys(top_track_uris))
+            added_count = spotify_add_tracks(token, playlist_id, top_track_uris)
+            rec_uris = top_track_uris
+
+        if added_count == 0:
+            print(
+                "No tracks could be added to the playlist.",
+                file=sys.stderr,
+                flush=True,
+            )
+            sys.exit(1)
+
+        # ── Upload playlist artwork ───────────────────────────────────
+        if artwork_future is not None:
+            print("Waiting for playlist artwork…", flush=True)
+            try:
+                artwork_b64 = artwork_future.result()
+                if artwork_b64:
+                    try:
+                        spotify_upload_playlist_cover_image(
+                            token,
+                            playlist_id,
+                            artwork_b64,
                         )
-            else:
+                        print("  Uploaded custom playlist artwork.", flush=True)
+                    except urllib.error.HTTPError as err:
+                        if err.code == 403:
+                            print(
+                                "  Artwork upload forbidden (403). "
+                                "Check ownership and ugc-image-upload scope.",
+                                file=sys.stderr,
+                                flush=True,
+                            )
+                        elif err.code == 429:
+                            print(
+                                "  Artwork upload rate limited (429). "
+                                "Skipping for now.",
+                                file=sys.stderr,
+                                flush=True,
+                            )
+                        else:
+                            print(
+                                f"  Artwork upload failed ({err}).",
+                                file=sys.stderr,
+                                flush=True,
+                            )
+                else:
+                    print(
+                        "  Artwork generation skipped or failed.",
+                        file=sys.stderr,
+                        flush=True,
+                    )
+            except Exception as err:
                 print(
-                    "  Artwork generation skipped or failed.",
+                    f"  ⚠ Artwork generation failed (rate limit?): {err}",
                     file=sys.stderr,
                     flush=True,
                 )
-        except Exception as err:
-            print(
-                f"  ⚠ Artwork generation failed (rate limit?): {err}",
-                file=sys.stderr,
-                flush=True,
-            )
+    finally:
+        # Never leave the job running into the next user's run
+        if artwork_future is not None and not artwork_future.done():
+            _discard_artwork(artwork_future)
 
     print(f"\n✓ Created playlist: {playlist_name}", flush=True)
     print(f"  Added tracks: {added_count}/{len(rec_uris)}", flush=True)
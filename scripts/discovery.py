@@ -4,8 +4,11 @@ from __future__ import annotations
 
 import random
 import sys
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
+from config import SPOTIFY_SEARCH_MAX_WORKERS
 from model_provider import AIProvider
 from recommendations import ai_recommend_search_queries
 from spotify_api import (
@@ -14,6 +17,65 @@ from spotify_api import (
 )
 
 
+SearchResult = tuple[list[str], dict[str, str]]
+
+
+def _search_concurrently(
+    spotify_token: str,
+    queries: list[str],
+    *,
+    remaining: Callable[[], int],
+    market: str | None = None,
+    limit: int = 10,
+) -> Iterator[Future[SearchResult]]:
+    """Run track searches on a thread pool, yielding futures in query order.
+
+    Queries are submitted in waves sized to the slots still open (about one
+    search per `limit` tracks needed, capped at the worker count), so no
+    request is sent whose results would only be discarded. Searches still
+    pending when the caller stops iterating are cancelled.
+    """
+    pending = list(queries)
+    with ThreadPoolExecutor(max_workers=SPOTIFY_SEARCH_MAX_WORKERS) as executor:
+        while pending:
+            needed = remaining()
+            if needed <= 0:
+                return
+            wave_size = min(SPOTIFY_SEARCH_MAX_WORKERS, -(-needed // limit))
+            wave, pending = pending[:wave_size], pending[wave_size:]
+            futures = [
+                executor.submit(
+                    spotify_search_tracks_with_artists,
+                    spotify_token,
+                    query,
+                    limit=limit,
+                    market=market,
+                )
+                for query in wave
+            ]
+            try:
+                yield from futures
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+def _uniq(
+    values: Iterable[str],
+    key: Callable[[str], str] | None = None,
+) -> list[str]:
+    """Order-preserving de-dupe, keeping the first value seen for each key."""
+    seen: set[str] = set()
+    add = seen.add
+    result: list[str] = []
+    for value in values:
+        marker = key(value) if key else value
+        if marker not in seen:
+            add(marker)
+            result.append(value)
+    return result
+
+
 def build_discovery_mix(
     spotify_token: str,
     provider: AIProvider,
@@ -40,18 +102,16 @@ def build_discovery_mix(
         Falls back to empty if rate limited.
     """
     known_uris: set[str] = {t["uri"] for t in source_tracks if t.get("uri")}
-    discovered: list[str] = []
-    discovered_set: set[str] = set()
+    discovered: dict[str, None] = {}  # Insertion-ordered set of URIs
     artist_map: dict[str, str] = primary_artist_map_from_tracks(source_tracks)
 
     def add(uri: str, cap: int) -> bool:
         if (
             uri not in known_uris
-            and uri not in discovered_set
+            and uri not in discovered
             and len(discovered) < cap
         ):
-            discovered.append(uri)
-            discovered_set.add(uri)
+            discovered[uri] = None
             return True
         return False
 
@@ -67,13 +127,16 @@ def build_discovery_mix(
             target_week=target_week,
             max_queries=30,
         )
-        for query in ai_queries:
+        for future in _search_concurrently(
+            spotify_token,
+            ai_queries,
+            remaining=lambda: 50 - len(discovered),
+            market=market,
+        ):
             if len(discovered) >= 50:
                 break
             try:
-                uris, search_artists = spotify_search_tracks_with_artists(
-                    spotify_token, query, limit=10, market=market,
-                )
+                uris, search_artists = future.result()
                 artist_map.update(search_artists)
                 for uri in uris:
                     add(uri, 50)
@@ -95,41 +158,44 @@ def build_discovery_mix(
 
     # ── Slot 2: Familiar anchors ────────────────────────────────────
     print("  Slot 2: Familiar anchors…", flush=True)
-    anchor_uris = list(dict.fromkeys(
-        t["uri"] for t in source_tracks if t.get("uri")
-    ))
+    anchor_uris = _uniq(t["uri"] for t in source_tracks if t.get("uri"))
     random.shuffle(anchor_uris)
     for uri in anchor_uris:
-        if uri not in discovered_set and len(discovered) < 65:
-            discovered.append(uri)
-            discovered_set.add(uri)
+        if uri not in discovered and len(discovered) < 65:
+            discovered[uri] = None
     anchor_count = len(discovered) - ai_count
 
     # ── Slot 3: Genre/artist search fallback ────────────────────────
     print("  Slot 3: Genre/artist search…", flush=True)
     try:
-        genres = list(
-            dict.fromkeys(
-                g for a in current_top_artists for g in a.get("genres", [])
-            )
+        # Case-insensitive so "Rock"/"rock" don't issue the same search twice
+        genres = _uniq(
+            (g for a in current_top_artists for g in a.get("genres", [])),
+            key=str.casefold,
         )
-        artist_names = list(
-            dict.fromkeys(
-                [a["name"] for a in source_artists if a.get("name")]
-                + [a["name"] for a in current_top_artists if a.get("name")]
-            )
+        artist_names = _uniq(
+            (
+                a["name"]
+                for artists in (source_artists, current_top_artists)
+                for a in artists
+                if a.get("name")
+            ),
+            key=str.casefold,
         )
         print(f"  Genre pool: {genres[:8]}", flush=True)
         queries = [f'genre:"{g}"' for g in genres[:8]] + [
             f'artist:"{n}"' for n in artist_names[:8]
         ]
-        for query in queries:
+        for future in _search_concurrently(
+            spotify_token,
+            queries,
+            remaining=lambda: 100 - len(discovered),
+            market=market,
+        ):
             if len(discovered) >= 100:
                 break
             try:
-                uris, search_artists = spotify_search_tracks_with_artists(
-                    spotify_token, query, limit=10, market=market,
-                )
+                uris, search_artists = future.result()
                 artist_map.update(search_artists)
                 for uri in uris:
                     add(uri, 100)
@@ -153,4 +219,4 @@ def build_discovery_mix(
         f"(ai={ai_count}, anchors={anchor_count}, search={search_count})",
         flush=True,
     )
-    return discovered, artist_map
+    return list(discovered), artist_map
@@ -1,18 +1,41 @@
-"""HTTP JSON request helper with retry support."""
+"""HTTP helpers: JSON requests with retry support, keep-alive downloads."""
 
 from __future__ import annotations
 
+import http.client
 import json
+import random
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
 from typing import Any
 
+try:
+    import orjson  # type: ignore
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from config import MAX_RETRIES, MAX_RETRY_WAIT_SECONDS, RETRY_BACKOFF
 
 
+def _dump_json(body: dict[str, Any] | list[Any]) -> bytes:
+    """Serialize a request body to UTF-8 JSON, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(body)
+    return json.dumps(body).encode("utf-8")
+
+
+def _load_json(content: bytes) -> Any:
+    """Parse a UTF-8 JSON response body, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
 def http_json(
     method: str,
     url: str,
@@ -28,7 +51,7 @@ def http_json(
     data: bytes | None = None
     if body is not None:
         request_headers["Content-Type"] = "application/json"
-        data = json.dumps(body).encode("utf-8")
+        data = _dump_json(body)
     elif form is not None:
         request_headers["Content-Type"] = "application/x-www-form-urlencoded"
         data = urllib.parse.urlencode(form).encode("utf-8")
@@ -40,8 +63,8 @@ def http_json(
     for attempt in range(retries):
         try:
             with urllib.request.urlopen(request) as response:
-                content = response.read().decode("utf-8")
-                return json.loads(content) if content else {}
+                content = response.read()
+                return _load_json(content) if content else {}
         except urllib.error.HTTPError as err:
             details = err.read().decode("utf-8", errors="replace")
             # Retry on 429 (rate limit) and 5xx (server errors)
@@ -52,23 +75,28 @@ def http_json(
                         err.headers.get("Retry-After", ""),
                     ).strip()
 
-                wait = RETRY_BACKOFF * (attempt + 1)
+                # Exponential backoff with jitter, so parallel callers that
+                # were throttled together don't all retry in the same instant
+                wait = min(
+                    RETRY_BACKOFF * 2 ** attempt + random.random(),
+                    MAX_RETRY_WAIT_SECONDS,
+                )
                 if retry_after_header:
                     try:
                         retry_after_seconds = float(retry_after_header)
                     except ValueError:
                         retry_after_seconds = 0.0
-                    if retry_after_seconds > 0:
+                    if retry_after_seconds > MAX_RETRY_WAIT_SECONDS:
+                        print(
+                            "Retry wait capped from "
+                            f"{retry_after_seconds:.1f}s to "
+                            f"{MAX_RETRY_WAIT_SECONDS:.1f}s.",
+                            file=sys.stderr,
+                        )
+                        wait = MAX_RETRY_WAIT_SECONDS
+                    elif retry_after_seconds > 0:
                         wait = retry_after_seconds
 
-                if wait > MAX_RETRY_WAIT_SECONDS:
-                    print(
-                        "Retry wait capped from "
-                        f"{wait:.1f}s to {MAX_RETRY_WAIT_SECONDS:.1f}s.",
-                        file=sys.stderr,
-                    )
-                    wait = MAX_RETRY_WAIT_SECONDS
-
                 print(
                     f"HTTP {err.code} on attempt {attempt + 1}/{retries}. "
                     f"Retrying in {wait:.1f}s…",
@@ -84,3 +112,165 @@ def http_json(
 
     # Should not be reached, but satisfies type checker
     raise RuntimeError(f"All {retries} retries exhausted for {method} {url}")
+
+
+# ── Keep-alive downloads ────────────────────────────────────────────
+
+_MAX_REDIRECTS = 5
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Same User-Agent urlopen() sends, so servers see no difference
+_DOWNLOAD_HEADERS = {"User-Agent": f"Python-urllib/{urllib.request.__version__}"}
+
+# Idle connections keyed by (scheme, netloc). A connection is popped while
+# in use, so concurrent callers never share one.
+_idle_connections: dict[tuple[str, str], http.client.HTTPConnection] = {}
+_idle_connections_lock = threading.Lock()
+
+
+def _acquire_connection(
+    scheme: str, netloc: str, timeout: float,
+) -> tuple[http.client.HTTPConnection, bool]:
+    """Return (connection, reused) for a host, preferring an idle one."""
+    with _idle_connections_lock:
+        conn = _idle_connections.pop((scheme, netloc), None)
+    if conn is not None:
+        return conn, True
+    if scheme == "https":
+        return http.client.HTTPSConnection(netloc, timeout=timeout), False
+    return http.client.HTTPConnection(netloc, timeout=timeout), False
+
+
+def _release_connection(
+    scheme: str,
+    netloc: str,
+    conn: http.client.HTTPConnection,
+    response: http.client.HTTPResponse,
+) -> None:
+    """Park a drained connection for reuse, or close it."""
+    if response.will_close:
+        conn.close()
+        return
+    with _idle_connections_lock:
+        idle = _idle_connections.setdefault((scheme, netloc), conn)
+    if idle is not conn:
+        conn.close()
+
+
+def _read_response_body(response: http.client.HTTPResponse) -> bytes:
+    """Read a response body, streaming into one pre-sized buffer when possible."""
+    content_length = str(response.getheader("Content-Length") or "").strip()
+    if not content_length.isdigit():
+        return response.read()
+
+    # readinto() fills the buffer in place, avoiding the intermediate
+    # chunk copies read() makes for multi-MB bodies.
+    buf = bytearray(int(content_length))
+    offset = 0
+    with memoryview(buf) as view:
+        while offset < len(buf):
+            n = response.readinto(view[offset:])
+            if not n:
+                break
+            offset += n
+    del buf[offset:]
+    return buf
+
+
+def _uses_proxy(scheme: str, host: str) -> bool:
+    """True when the environment routes this host through a proxy."""
+    if scheme not in urllib.request.getproxies():
+        return False
+    return not urllib.request.proxy_bypass(host)
+
+
+def _urlopen_bytes(url: str, timeout: float) -> bytes:
+    """GET a URL through urllib, which applies the environment's proxies."""
+    request = urllib.request.Request(url, headers=_DOWNLOAD_HEADERS)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read()
+    except urllib.error.HTTPError as err:
+        details = err.read().decode("utf-8", errors="replace")
+        print(f"HTTP error {err.code} for GET {url}: {details}", file=sys.stderr)
+        raise
+
+
+def _send_get(
+    scheme: str, netloc: str, path: str, timeout: float,
+) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+    """Send a GET on a pooled connection and return it with the response."""
+    conn, reused = _acquire_connection(scheme, netloc, timeout)
+    try:
+        conn.request("GET", path, headers=_DOWNLOAD_HEADERS)
+        return conn, conn.getresponse()
+    except (ConnectionError, http.client.HTTPException):
+        conn.close()
+        if not reused:
+            raise
+    except BaseException:
+        conn.close()
+        raise
+
+    # The server dropped the idle connection; retry once on a fresh one
+    conn, _ = _acquire_connection(scheme, netloc, timeout)
+    try:
+        conn.request("GET", path, headers=_DOWNLOAD_HEADERS)
+        return conn, conn.getresponse()
+    except BaseException:
+        conn.close()
+        raise
+
+
+def http_get_bytes(url: str, *, timeout: float = 30.0) -> bytes:
+    """GET a URL and return the raw body.
+
+    Connections are kept alive and reused per host, so repeated downloads
+    from the same server (e.g. artwork for several users) skip the TCP and
+    TLS handshakes. Hosts behind a configured proxy go through urllib
+    instead. Follows redirects; raises HTTPError on 4xx/5xx.
+    """
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"Unsupported URL: {url}")
+        if _uses_proxy(parts.scheme, parts.hostname or ""):
+            return _urlopen_bytes(url, timeout)
+        path = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+
+        conn, response = _send_get(parts.scheme, parts.netloc, path, timeout)
+        # Drain the response before touching the pool; any failure while
+        # reading leaves the connection unusable, so close it.
+        try:
+            if response.status in _REDIRECT_STATUSES:
+                response.read()
+            elif response.status >= 400:
+                details = response.read().decode("utf-8", errors="replace")
+            else:
+                body = _read_response_body(response)
+        except BaseException:
+            conn.close()
+            raise
+        _release_connection(parts.scheme, parts.netloc, conn, response)
+
+        if response.status in _REDIRECT_STATUSES:
+            location = response.getheader("Location")
+            if not location:
+                raise urllib.error.HTTPError(
+                    url, response.status, "Redirect without Location",
+                    response.msg, None,
+                )
+            url = urllib.parse.urljoin(url, location)
+            continue
+
+        if response.status >= 400:
+            print(
+                f"HTTP error {response.status} for GET {url}: {details}",
+                file=sys.stderr,
+            )
+            raise urllib.error.HTTPError(
+                url, response.status, response.reason, response.msg, None,
+            )
+
+        return body
+
+    raise RuntimeError(f"Too many redirects for GET {url}")
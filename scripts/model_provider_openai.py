@@ -2,12 +2,21 @@
 
 from __future__ import annotations
 
+import functools
 from typing import Any
 
 from model_provider import AIProvider
 from http_client import http_json
 
 
+@functools.lru_cache(maxsize=16)
+def _system_prompt_with_json(system_prompt: str) -> str:
+    """JSON mode requires "json" to appear somewhere in the messages."""
+    if "json" in system_prompt.lower():
+        return system_prompt
+    return f"{system_prompt} Respond in JSON format."
+
+
 class OpenAIProvider(AIProvider):
     """OpenAI API provider for text and image generation."""
 
@@ -20,6 +29,10 @@ class OpenAIProvider(AIProvider):
         """
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
 
     def generate_text(
         self,
@@ -33,16 +46,12 @@ class OpenAIProvider(AIProvider):
         Returns a dict compatible with OpenAI response format:
         {"choices": [{"message": {"content": "..."}}]}
         """
-        # For JSON mode, ensure "json" appears in the messages
-        system_with_json = system_prompt if "json" in system_prompt.lower() else f"{system_prompt} Respond in JSON format."
-        
+        system_with_json = _system_prompt_with_json(system_prompt)
+
         response = http_json(
             "POST",
             f"{self.base_url}/chat/completions",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
+            headers=self._headers,
             body={
                 "model": model,
                 "temperature": temperature,
@@ -76,10 +85,7 @@ class OpenAIProvider(AIProvider):
         response = http_json(
             "POST",
             f"{self.base_url}/images/generations",
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
+            headers=self._headers,
             body={
                 "model": model,
                 "prompt": prompt,
@@ -3,14 +3,19 @@
 from __future__ import annotations
 
 import datetime as dt
+import re
 import sys
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 
 from config import SPOTIFY_API_BASE, SPOTIFY_PLAYLIST_DESCRIPTION_MAX
 from http_client import http_json
+import track_cache
 
 
 # ── User profile ────────────────────────────────────────────────────
@@ -121,55 +126,116 @@ def spotify_get_playlist_tracks(
     return tracks
 
 
+class _LeakyBucket:
+    """Thread-safe rate limiter that hands out evenly spaced request slots."""
+
+    def __init__(self, rate_per_second: float) -> None:
+        self._interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until the caller's slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# Spotify track IDs are base-62; the anchored pattern rejects anything else
+_TRACK_URI_MATCH = re.compile(r"spotify:track:([A-Za-z0-9]+)").fullmatch
+
+# Track lookups currently on the wire, keyed by track ID, so concurrent
+# callers asking for the same track share one GET /tracks request.
+_inflight_lookups: dict[str, Future[str]] = {}
+_inflight_lock = threading.Lock()
+
+
 def spotify_track_primary_artist_by_uri(
     token: str,
     uris: list[str],
     *,
     market: str | None = None,
+    rps: float = 10.0,
+    concurrency: int = 2,
 ) -> dict[str, str]:
-    """Return a map of track URI -> primary artist ID (or name fallback)."""
-    uri_to_track_id: dict[str, str] = {}
-    for uri in uris:
-        if uri in uri_to_track_id:
-            continue
-        parts = uri.split(":")
-        if len(parts) == 3 and parts[0] == "spotify" and parts[1] == "track":
-            uri_to_track_id[uri] = parts[2]
+    """Return a map of track URI -> primary artist ID (or name fallback).
+
+    Previously seen tracks are answered from the on-disk track cache; the
+    rest are looked up in batches of 50, `concurrency` batches at a time,
+    paced to at most `rps` requests per second. Tracks another thread is
+    already fetching are awaited rather than requested again.
+    """
+    uri_to_track_id = {
+        uri: match.group(1)
+        for uri in dict.fromkeys(uris)
+        if (match := _TRACK_URI_MATCH(uri))
+    }
 
     if not uri_to_track_id:
         return {}
 
     track_ids = list(dict.fromkeys(uri_to_track_id.values()))
-    primary_artist_by_track_id: dict[str, str] = {}
-
-    for i in range(0, len(track_ids), 50):
-        batch_ids = track_ids[i : i + 50]
-        query: dict[str, str] = {"ids": ",".join(batch_ids)}
-        if market:
-            query["market"] = market
-        params = urllib.parse.urlencode(query)
-        payload = http_json(
+    primary_artist_by_track_id = track_cache.get_many(track_ids)
+    missing_ids = [i for i in track_ids if i not in primary_artist_by_track_id]
+
+    owned_ids: list[str] = []
+    pending: dict[str, Future[str]] = {}
+    with _inflight_lock:
+        for track_id in missing_ids:
+            future = _inflight_lookups.get(track_id)
+            if future is None:
+                _inflight_lookups[track_id] = Future()
+                owned_ids.append(track_id)
+            else:
+                pending[track_id] = future
+
+    bucket = _LeakyBucket(rps)
+    market_query = {"market": market} if market else {}
+
+    def _fetch_batch(batch_ids: list[str]) -> dict[str, Any]:
+        params = urllib.parse.urlencode({"ids": ",".join(batch_ids)} | market_query)
+        bucket.acquire()
+        return http_json(
             "GET",
             f"{SPOTIFY_API_BASE}/tracks?{params}",
             headers={"Authorization": f"Bearer {token}"},
         )
 
-        for track in payload.get("tracks", []):
-            if not track:
-                continue
-            track_id = str(track.get("id") or "").strip()
-            if not track_id:
-                continue
+    batches = [owned_ids[i : i + 50] for i in range(0, len(owned_ids), 50)]
+    fetched: dict[str, str] = {}
+    try:
+        if len(batches) <= 1:
+            payloads = [_fetch_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                payloads = list(executor.map(_fetch_batch, batches))
+
+        for payload in payloads:
+            for track in payload.get("tracks", []):
+                if not track:
+                    continue
+                track_id = str(track.get("id") or "").strip()
+                if not track_id:
+                    continue
+                fetched[track_id] = _primary_artist_id(track)
+
+        track_cache.put_many({k: v for k, v in fetched.items() if v})
+    except BaseException as err:
+        with _inflight_lock:
+            for track_id in owned_ids:
+                _inflight_lookups.pop(track_id).set_exception(err)
+        raise
 
-            artists = track.get("artists") or []
-            primary_artist = ""
-            if artists:
-                first_artist = artists[0] or {}
-                primary_artist = str(
-                    first_artist.get("id") or first_artist.get("name") or "",
-                ).strip()
+    with _inflight_lock:
+        for track_id in owned_ids:
+            _inflight_lookups.pop(track_id).set_result(fetched.get(track_id, ""))
 
-            primary_artist_by_track_id[track_id] = primary_artist
+    primary_artist_by_track_id.update(fetched)
+    for track_id, future in pending.items():
+        primary_artist_by_track_id[track_id] = future.result()
 
     return {
         uri: primary_artist_by_track_id.get(track_id, "")
@@ -468,9 +534,17 @@ def spotify_search_tracks_with_artists(
             f"{SPOTIFY_API_BASE}/search?{params}",
             headers={"Authorization": f"Bearer {token}"},
         )
-        items = payload.get("tracks", {}).get("items", [])
-        uris = [t["uri"] for t in items if t.get("uri")]
-        artist_map = primary_artist_map_from_tracks(items)
+        uris: list[str] = []
+        artist_map: dict[str, str] = {}
+        for track in payload.get("tracks", {}).get("items", []):
+            uri = track.get("uri")
+            if not uri:
+                continue
+            uris.append(uri)
+            if uri not in artist_map:
+                artist = _primary_artist_id(track)
+                if artist:
+                    artist_map[uri] = artist
         print(f"  Search '{query}': {len(uris)} tracks", flush=True)
         return uris, artist_map
     except Exception as exc:
@@ -3,8 +3,18 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import json
+import os
+import sys
+import time
+from typing import Any
 
-from config import SPOTIFY_ACCOUNTS_BASE
+from config import (
+    SPOTIFY_ACCOUNTS_BASE,
+    SPOTIFY_TOKEN_CACHE_FILE,
+    SPOTIFY_TOKEN_EXPIRY_MARGIN_SECONDS,
+)
 from http_client import http_json
 
 REQUIRED_SCOPES = {
@@ -16,6 +26,51 @@ REQUIRED_SCOPES = {
 }
 
 
+def _token_cache_key(client_id: str, refresh_token: str) -> str:
+    """Hash the credentials so the cache file never holds a refresh token."""
+    return hashlib.sha256(f"{client_id}:{refresh_token}".encode()).hexdigest()
+
+
+def _read_token_cache() -> dict[str, dict[str, Any]]:
+    """Load cached access tokens, dropping expired entries."""
+    try:
+        entries = json.loads(SPOTIFY_TOKEN_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(entries, dict):
+        return {}
+
+    now = time.time()
+    fresh: dict[str, dict[str, Any]] = {}
+    for key, entry in entries.items():
+        try:
+            expires_at = float(entry["expires_at"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if entry.get("access_token") and expires_at - SPOTIFY_TOKEN_EXPIRY_MARGIN_SECONDS > now:
+            fresh[key] = entry
+    return fresh
+
+
+def _write_token_cache(entries: dict[str, dict[str, Any]]) -> None:
+    """Atomically write the token cache, readable by the current user only."""
+    tmp_path = SPOTIFY_TOKEN_CACHE_FILE.with_name(
+        f"{SPOTIFY_TOKEN_CACHE_FILE.name}.{os.getpid()}.tmp",
+    )
+    try:
+        SPOTIFY_TOKEN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(entries, handle)
+        os.replace(tmp_path, SPOTIFY_TOKEN_CACHE_FILE)
+    except OSError as err:
+        print(f"Could not write token cache: {err}", file=sys.stderr, flush=True)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
 def spotify_access_token(
     client_id: str,
     client_secret: str,
@@ -23,17 +78,31 @@ def spotify_access_token(
 ) -> tuple[str, set[str]]:
     """Exchange a refresh token for an access token.
 
+    Unexpired access tokens are reused from SPOTIFY_TOKEN_CACHE_FILE so
+    back-to-back runs skip the token round-trip.
+
     Returns (access_token, granted_scopes).
     """
-    basic = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
-    response = http_json(
-        "POST",
-        f"{SPOTIFY_ACCOUNTS_BASE}/api/token",
-        headers={"Authorization": f"Basic {basic}"},
-        form={"grant_type": "refresh_token", "refresh_token": refresh_token},
-    )
+    cache_key = _token_cache_key(client_id, refresh_token)
+    cache = _read_token_cache()
+    cached = cache.get(cache_key)
+
+    if cached:
+        access_token = str(cached["access_token"])
+        granted = set(str(cached.get("scope") or "").split())
+        print("Using cached Spotify access token.", flush=True)
+    else:
+        basic = base64.b64encode(f"{client_id}:{client_secret}".encode()).decode()
+        response = http_json(
+            "POST",
+            f"{SPOTIFY_ACCOUNTS_BASE}/api/token",
+            headers={"Authorization": f"Basic {basic}"},
+            form={"grant_type": "refresh_token", "refresh_token": refresh_token},
+        )
+        access_token = response["access_token"]
+        granted = set(response.get("scope", "").split())
+        expires_at = time.time() + float(response.get("expires_in") or 0)
 
-    granted = set(response.get("scope", "").split())
     print(f"Granted scopes: {granted}", flush=True)
     missing = REQUIRED_SCOPES - granted
     if missing:
@@ -47,4 +116,12 @@ def spotify_access_token(
         )
         raise RuntimeError(msg)
 
-    return response["access_token"], granted
+    if not cached:
+        cache[cache_key] = {
+            "access_token": access_token,
+            "scope": " ".join(sorted(granted)),
+            "expires_at": expires_at,
+        }
+        _write_token_cache(cache)
+
+    return access_token, granted
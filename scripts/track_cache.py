@@ -0,0 +1,77 @@
+"""Persistent SQLite cache of Spotify track ID -> primary artist lookups."""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import time
+from contextlib import closing
+from pathlib import Path
+
+from config import TRACK_CACHE_FILE, TRACK_CACHE_TTL_DAYS
+
+# Stay well under SQLite's bound-parameter limit for IN (...) queries
+_QUERY_CHUNK = 500
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    """Open the cache database, creating it and its table if needed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=5.0)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS track_artist ("
+        "id TEXT PRIMARY KEY, artist TEXT NOT NULL, expires INTEGER NOT NULL)",
+    )
+    return conn
+
+
+def get_many(ids: list[str], *, path: Path | None = None) -> dict[str, str]:
+    """Return unexpired cached {track_id: primary_artist} entries for `ids`.
+
+    Cache errors are reported and treated as misses.
+    """
+    if not ids:
+        return {}
+
+    now = int(time.time())
+    found: dict[str, str] = {}
+    try:
+        with closing(_connect(path or TRACK_CACHE_FILE)) as conn:
+            for i in range(0, len(ids), _QUERY_CHUNK):
+                chunk = ids[i : i + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    "SELECT id, artist FROM track_artist "
+                    f"WHERE expires > ? AND id IN ({placeholders})",
+                    [now, *chunk],
+                )
+                found.update(rows)
+    except (OSError, sqlite3.Error) as err:
+        print(f"Track cache read failed: {err}", file=sys.stderr, flush=True)
+        return {}
+    return found
+
+
+def put_many(
+    mapping: dict[str, str],
+    *,
+    ttl_days: int = TRACK_CACHE_TTL_DAYS,
+    path: Path | None = None,
+) -> None:
+    """Store {track_id: primary_artist} entries, expiring after `ttl_days`.
+
+    Cache errors are reported and otherwise ignored.
+    """
+    if not mapping:
+        return
+
+    expires = int(time.time()) + ttl_days * 86400
+    try:
+        with closing(_connect(path or TRACK_CACHE_FILE)) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO track_artist (id, artist, expires) "
+                "VALUES (?, ?, ?)",
+                [(track_id, artist, expires) for track_id, artist in mapping.items()],
+            )
+    except (OSError, sqlite3.Error) as err:
+        print(f"Track cache write failed: {err}", file=sys.stderr, flush=True)
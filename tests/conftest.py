@@ -0,0 +1,11 @@
+"""Shared pytest setup: make the modules under scripts/ importable."""
+from __future__ import annotations
+
+import os
+import sys
+
+_SCRIPTS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "scripts"),
+)
+if _SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, _SCRIPTS_DIR)
@@ -0,0 +1,137 @@
+"""Unit tests for artwork compression — synthetic images, no network calls."""
+from __future__ import annotations
+
+import io
+import unittest
+from unittest.mock import patch, MagicMock
+
+from PIL import Image
+
+import artwork
+from artwork import _compress_image_if_needed, _encode_jpeg
+
+
+# ── Helpers ──────────────────────────────────────────────────────────
+
+
+def _textured_image(size: int) -> Image.Image:
+    """An RGB image with enough detail that JPEG size tracks quality."""
+    noise = Image.effect_noise((size, size), 40)
+    gradient = Image.linear_gradient("L").resize((size, size))
+    return Image.merge(
+        "RGB", (noise, gradient, noise.transpose(Image.Transpose.ROTATE_90)),
+    )
+
+
+def _encoded(img: Image.Image, fmt: str, **params: object) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **params)
+    return buf.getvalue()
+
+
+def _decode(image_bytes: bytes) -> Image.Image:
+    img = Image.open(io.BytesIO(image_bytes))
+    img.load()
+    return img
+
+
+# ── Tests ────────────────────────────────────────────────────────────
+
+
+@patch("artwork._optimize_jpeg_losslessly", return_value=None)
+class TestCompressImageIfNeeded(unittest.TestCase):
+    """Tests for _compress_image_if_needed."""
+
+    def test_small_jpeg_returned_untouched(self, _lossless: object) -> None:
+        """A JPEG already within the limit is the very same object."""
+        jpeg = _encoded(_textured_image(64), "JPEG", quality=90)
+
+        self.assertIs(_compress_image_if_needed(jpeg, max_bytes=len(jpeg)), jpeg)
+
+    def test_small_png_transcoded_to_jpeg(self, _lossless: object) -> None:
+        """Spotify covers must be JPEG, so even a tiny PNG is re-encoded."""
+        png = _encoded(_textured_image(64), "PNG")
+
+        result = _compress_image_if_needed(png, max_bytes=len(png) * 10)
+
+        self.assertEqual(_decode(result).format, "JPEG")
+
+    def test_rgba_flattened_onto_white(self, _lossless: object) -> None:
+        png = _encoded(Image.new("RGBA", (32, 32), (255, 0, 0, 0)), "PNG")
+
+        img = _decode(_compress_image_if_needed(png))
+
+        self.assertEqual(img.mode, "RGB")
+        for channel in img.getpixel((16, 16)):
+            self.assertGreaterEqual(channel, 250)
+
+    def test_oversized_image_fits_limit(self, _lossless: object) -> None:
+        """Large artwork is downscaled and re-encoded under the byte limit."""
+        max_bytes = 256 * 1024
+        png = _encoded(_textured_image(1024), "PNG")
+        self.assertGreater(len(png), max_bytes)
+
+        result = _compress_image_if_needed(png, max_bytes=max_bytes)
+
+        self.assertLessEqual(len(result), max_bytes)
+        img = _decode(result)
+        self.assertEqual(img.format, "JPEG")
+        self.assertLessEqual(
+            max(img.size), artwork.SPOTIFY_PLAYLIST_IMAGE_MAX_DIMENSION,
+        )
+
+    def test_bisect_matches_linear_scan(self, _lossless: object) -> None:
+        """The bisection picks the highest quality a linear scan would."""
+        img = _textured_image(256)
+        png = _encoded(img, "PNG")
+        qualities = range(95, artwork._MIN_JPEG_QUALITY - 1, -2)
+
+        encodings: dict[int, bytes] = {}
+        with io.BytesIO() as buf:
+            for quality in qualities:
+                _encode_jpeg(img, quality, buf)
+                encodings[quality] = buf.getvalue()
+
+        for quality in (95, 89, 77, 61):
+            # A limit just under the next quality up makes `quality` the best fit
+            higher = encodings.get(quality + 2)
+            max_bytes = len(higher) - 1 if higher else len(encodings[quality])
+            with self.subTest(quality=quality):
+                linear = next(
+                    data for data in encodings.values() if len(data) <= max_bytes
+                )
+                self.assertEqual(
+                    _compress_image_if_needed(png, max_bytes=max_bytes), linear,
+                )
+
+    def test_in_loop_lossless_pass_needs_mozjpeg(self, lossless: MagicMock) -> None:
+        """Re-encoded output only gets a lossless pass when mozjpeg is present."""
+        img = _textured_image(256)
+        png = _encoded(img, "PNG")
+        with io.BytesIO() as buf:
+            top_size = _encode_jpeg(img, 95, buf)
+        # Top-quality encode lands just over the limit
+        max_bytes = int(top_size / 1.1)
+
+        for available, expected_calls in ((False, 0), (True, 1)):
+            lossless.reset_mock()
+            with self.subTest(mozjpeg=available), patch(
+                "artwork.MOZJPEG_AVAILABLE", available,
+            ):
+                _compress_image_if_needed(png, max_bytes=max_bytes)
+                self.assertEqual(lossless.call_count, expected_calls)
+
+    def test_unreachable_limit_returns_input(self, _lossless: object) -> None:
+        png = _encoded(_textured_image(128), "PNG")
+
+        self.assertIs(_compress_image_if_needed(png, max_bytes=100), png)
+
+    def test_png_without_pillow_warns(self, _lossless: object) -> None:
+        """Without Pillow a non-JPEG can't be fixed, but it isn't silent."""
+        png = _encoded(_textured_image(16), "PNG")
+
+        with patch("artwork.PIL_AVAILABLE", False), patch("sys.stderr") as stderr:
+            self.assertIs(_compress_image_if_needed(png), png)
+
+        written = "".join(call.args[0] for call in stderr.write.call_args_list)
+        self.assertIn("not a JPEG", written)
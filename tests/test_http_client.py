@@ -0,0 +1,220 @@
+"""Unit tests for http_client helpers — no external network calls."""
+from __future__ import annotations
+
+import http.server
+import io
+import threading
+import unittest
+import urllib.error
+from unittest.mock import patch, MagicMock
+
+import http_client
+from http_client import http_get_bytes, http_json
+
+
+# ── Helpers ──────────────────────────────────────────────────────────
+
+
+def _http_error(
+    code: int, headers: dict[str, str] | None = None,
+) -> urllib.error.HTTPError:
+    return urllib.error.HTTPError(
+        "https://api.spotify.com/v1/tracks",
+        code,
+        "error",
+        headers or {},  # type: ignore[arg-type]
+        io.BytesIO(b""),
+    )
+
+
+def _json_response(payload: bytes) -> MagicMock:
+    response = MagicMock()
+    response.__enter__.return_value.read.return_value = payload
+    return response
+
+
+class _DownloadHandler(http.server.BaseHTTPRequestHandler):
+    """Local test server; records (path, client port, User-Agent) per request."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.seen.append(  # type: ignore[attr-defined]
+            (self.path, self.client_address[1], self.headers.get("User-Agent")),
+        )
+        if self.path == "/ok":
+            self._send_body(200, b"hello")
+        elif self.path == "/close":
+            # Keep-alive response, but drop the socket once it is sent
+            self._send_body(200, b"bye")
+            self.close_connection = True
+        elif self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/missing":
+            self._send_body(404, b"not here")
+        elif self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"hello", b", ", b"world"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+
+    def _send_body(self, status: int, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+# ── Tests ────────────────────────────────────────────────────────────
+
+
+@patch("http_client.time.sleep")
+@patch("http_client.urllib.request.urlopen")
+class TestHttpJsonRetry(unittest.TestCase):
+    """Retry behaviour of http_json on throttling and server errors."""
+
+    def test_429_retries_then_succeeds(
+        self, mock_urlopen: MagicMock, mock_sleep: MagicMock,
+    ) -> None:
+        """A 429 honours Retry-After, then the retried request succeeds."""
+        mock_urlopen.side_effect = [
+            _http_error(429, {"Retry-After": "3"}),
+            _json_response(b'{"tracks": []}'),
+        ]
+
+        result = http_json("GET", "https://api.spotify.com/v1/tracks?ids=A")
+
+        self.assertEqual(result, {"tracks": []})
+        self.assertEqual(mock_urlopen.call_count, 2)
+        mock_sleep.assert_called_once_with(3.0)
+
+    @patch("http_client.random.random", return_value=0.5)
+    def test_backoff_is_exponential_without_retry_after(
+        self, _random: MagicMock, mock_urlopen: MagicMock, mock_sleep: MagicMock,
+    ) -> None:
+        """Without Retry-After, waits double per attempt plus jitter."""
+        mock_urlopen.side_effect = [
+            _http_error(503),
+            _http_error(503),
+            _http_error(503),
+            _json_response(b"{}"),
+        ]
+
+        http_json("GET", "https://api.spotify.com/v1/me")
+
+        waits = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(waits, [2.5, 4.5, 8.5])
+
+    def test_403_is_not_retried(
+        self, mock_urlopen: MagicMock, mock_sleep: MagicMock,
+    ) -> None:
+        """Client errors other than 429 propagate immediately."""
+        mock_urlopen.side_effect = _http_error(403)
+
+        with self.assertRaises(urllib.error.HTTPError):
+            http_json("GET", "https://api.spotify.com/v1/me")
+
+        self.assertEqual(mock_urlopen.call_count, 1)
+        mock_sleep.assert_not_called()
+
+
+class TestHttpGetBytes(unittest.TestCase):
+    """http_get_bytes against a local keep-alive HTTP server."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), _DownloadHandler,
+        )
+        cls.server.daemon_threads = True
+        cls.server.seen = []  # type: ignore[attr-defined]
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.server.seen.clear()  # type: ignore[attr-defined]
+        self.addCleanup(self._close_idle_connections)
+        proxies_patch = patch("http_client.urllib.request.getproxies", return_value={})
+        proxies_patch.start()
+        self.addCleanup(proxies_patch.stop)
+
+    @staticmethod
+    def _close_idle_connections() -> None:
+        with http_client._idle_connections_lock:
+            for conn in http_client._idle_connections.values():
+                conn.close()
+            http_client._idle_connections.clear()
+
+    def _client_ports(self) -> list[int]:
+        return [port for _, port, _ in self.server.seen]  # type: ignore[attr-defined]
+
+    def test_reuses_connection(self) -> None:
+        """Back-to-back downloads from one host share a connection."""
+        self.assertEqual(http_get_bytes(f"{self.base_url}/ok"), b"hello")
+        self.assertEqual(http_get_bytes(f"{self.base_url}/ok"), b"hello")
+
+        ports = self._client_ports()
+        self.assertEqual(len(ports), 2)
+        self.assertEqual(ports[0], ports[1])
+
+    def test_sends_user_agent(self) -> None:
+        http_get_bytes(f"{self.base_url}/ok")
+        _, _, user_agent = self.server.seen[0]  # type: ignore[attr-defined]
+        self.assertTrue(str(user_agent).startswith("Python-urllib/"))
+
+    def test_retries_when_idle_connection_was_closed(self) -> None:
+        """A pooled connection the server dropped is replaced transparently."""
+        self.assertEqual(http_get_bytes(f"{self.base_url}/close"), b"bye")
+        self.assertEqual(http_get_bytes(f"{self.base_url}/ok"), b"hello")
+
+        ports = self._client_ports()
+        self.assertEqual(len(ports), 2)
+        self.assertNotEqual(ports[0], ports[1])
+
+    def test_follows_redirect(self) -> None:
+        self.assertEqual(http_get_bytes(f"{self.base_url}/redirect"), b"hello")
+        paths = [path for path, _, _ in self.server.seen]  # type: ignore[attr-defined]
+        self.assertEqual(paths, ["/redirect", "/ok"])
+        # The drained redirect response leaves the connection reusable
+        self.assertEqual(len(set(self._client_ports())), 1)
+
+    def test_404_raises_http_error(self) -> None:
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            http_get_bytes(f"{self.base_url}/missing")
+        self.assertEqual(ctx.exception.code, 404)
+        # The connection is still usable after a drained error body
+        self.assertEqual(http_get_bytes(f"{self.base_url}/ok"), b"hello")
+        self.assertEqual(len(set(self._client_ports())), 1)
+
+    def test_reads_chunked_body_without_content_length(self) -> None:
+        self.assertEqual(
+            http_get_bytes(f"{self.base_url}/chunked"), b"hello, world",
+        )
+
+    @patch("http_client.urllib.request.urlopen")
+    def test_proxied_host_goes_through_urlopen(self, mock_urlopen: MagicMock) -> None:
+        """With a proxy configured, the download is left to urllib."""
+        mock_urlopen.return_value = _json_response(b"via proxy")
+        with patch(
+            "http_client.urllib.request.getproxies",
+            return_value={"http": "http://proxy.invalid:3128"},
+        ), patch("http_client.urllib.request.proxy_bypass", return_value=False):
+            body = http_get_bytes(f"{self.base_url}/ok")
+
+        self.assertEqual(body, b"via proxy")
+        request = mock_urlopen.call_args[0][0]
+        self.assertEqual(request.full_url, f"{self.base_url}/ok")
+        self.assertEqual(self.server.seen, [])  # type: ignore[attr-defined]
@@ -6,6 +6,14 @@ import base64
 from pathlib import Path
 from datetime import datetime, timedelta
 
+try:
+    import pytest
+except ImportError:  # run directly as a script, pytest not needed
+    pytest = None
+else:
+    # Every test here hits the live OpenAI API; skip with -m "not slow"
+    pytestmark = pytest.mark.slow
+
 TIMESTAMP = datetime.now().strftime("%Y%m%d_%H%M%S")
 
 # Compute dynamic week labels relative to today
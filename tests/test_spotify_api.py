@@ -2,15 +2,17 @@
 from __future__ import annotations
 
 import json
-import os
-import sys
+import tempfile
+import threading
 import unittest
 import urllib.error
+import urllib.parse
+from concurrent.futures import Future
+from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock
 
-# Add scripts to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
-
+from create_weekly_playlist import _spread_tracks_by_artist
 from spotify_api import (
     primary_artist_map_from_tracks,
     spotify_search_tracks_with_artists,
@@ -29,20 +31,27 @@ def _make_track(track_id: str, artist_id: str, artist_name: str) -> dict:
     }
 
 
+def _ids_from_url(url: str) -> list[str]:
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+    return query["ids"][0].split(",")
+
+
+def _tracks_response_for_url(method: str, url: str, **_: object) -> dict:
+    """Fake GET /tracks response built from the IDs in the request URL."""
+    return {
+        "tracks": [
+            _make_track(track_id, f"a{track_id}", f"Artist {track_id}")
+            for track_id in _ids_from_url(url)
+        ],
+    }
+
+
 SAMPLE_URIS = [
     "spotify:track:AAA111",
     "spotify:track:BBB222",
     "spotify:track:CCC333",
 ]
 
-SAMPLE_RESPONSE = {
-    "tracks": [
-        _make_track("AAA111", "artist1", "Artist One"),
-        _make_track("BBB222", "artist2", "Artist Two"),
-        _make_track("CCC333", "artist3", "Artist Three"),
-    ],
-}
-
 
 # ── Tests ────────────────────────────────────────────────────────────
 
@@ -50,10 +59,34 @@ SAMPLE_RESPONSE = {
 class TestTrackPrimaryArtistByUri(unittest.TestCase):
     """Tests for spotify_track_primary_artist_by_uri."""
 
+    SAMPLE_RESPONSE: MappingProxyType
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Built once and read-only so no test can leak edits into another
+        cls.SAMPLE_RESPONSE = MappingProxyType({
+            "tracks": (
+                _make_track("AAA111", "artist1", "Artist One"),
+                _make_track("BBB222", "artist2", "Artist Two"),
+                _make_track("CCC333", "artist3", "Artist Three"),
+            ),
+        })
+
+    def setUp(self) -> None:
+        # Point the on-disk track cache at a throwaway database per test
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        cache_patch = patch(
+            "track_cache.TRACK_CACHE_FILE",
+            Path(tmp_dir.name) / "track_artist.sqlite",
+        )
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
     @patch("spotify_api.http_json")
     def test_basic_lookup(self, mock_http: MagicMock) -> None:
         """Normal case: returns artist map keyed by URI."""
-        mock_http.return_value = SAMPLE_RESPONSE
+        mock_http.return_value = self.SAMPLE_RESPONSE
 
         result = spotify_track_primary_artist_by_uri("fake-token", SAMPLE_URIS)
 
@@ -67,7 +100,7 @@ class TestTrackPrimaryArtistByUri(unittest.TestCase):
     @patch("spotify_api.http_json")
     def test_market_parameter_passed(self, mock_http: MagicMock) -> None:
         """When market is provided, it appears in the URL query string."""
-        mock_http.return_value = SAMPLE_RESPONSE
+        mock_http.return_value = self.SAMPLE_RESPONSE
 
         spotify_track_primary_artist_by_uri(
             "fake-token", SAMPLE_URIS, market="GB",
@@ -79,7 +112,7 @@ class TestTrackPrimaryArtistByUri(unittest.TestCase):
     @patch("spotify_api.http_json")
     def test_no_market_by_default(self, mock_http: MagicMock) -> None:
         """When market is None, no market param in the URL."""
-        mock_http.return_value = SAMPLE_RESPONSE
+        mock_http.return_value = self.SAMPLE_RESPONSE
 
         spotify_track_primary_artist_by_uri("fake-token", SAMPLE_URIS)
 
@@ -89,37 +122,105 @@ class TestTrackPrimaryArtistByUri(unittest.TestCase):
     @patch("spotify_api.http_json")
     def test_batching(self, mock_http: MagicMock) -> None:
         """Verify IDs are batched in groups of 50."""
-        # 75 unique URIs → 2 batches (50 + 25)
+        # 75 unique URIs → 2 batches (50 + 25), fetched concurrently so the
+        # mock answers from each request's own IDs rather than call order.
         uris = [f"spotify:track:T{i:04d}" for i in range(75)]
-        batch1_tracks = [
-            _make_track(f"T{i:04d}", f"a{i}", f"Artist {i}")
-            for i in range(50)
-        ]
-        batch2_tracks = [
-            _make_track(f"T{i:04d}", f"a{i}", f"Artist {i}")
-            for i in range(50, 75)
-        ]
-        mock_http.side_effect = [
-            {"tracks": batch1_tracks},
-            {"tracks": batch2_tracks},
-        ]
+        mock_http.side_effect = _tracks_response_for_url
 
         result = spotify_track_primary_artist_by_uri("fake-token", uris)
 
         self.assertEqual(len(result), 75)
+        self.assertEqual(result["spotify:track:T0074"], "aT0074")
         self.assertEqual(mock_http.call_count, 2)
+        batch_sizes = sorted(
+            len(_ids_from_url(call.args[1])) for call in mock_http.call_args_list
+        )
+        self.assertEqual(batch_sizes, [25, 50])
 
     @patch("spotify_api.http_json")
     def test_deduplicates_uris(self, mock_http: MagicMock) -> None:
         """Duplicate URIs should not cause duplicate API calls."""
-        duped = SAMPLE_URIS + SAMPLE_URIS
-        mock_http.return_value = SAMPLE_RESPONSE
+        duped = SAMPLE_URIS[::-1] + SAMPLE_URIS
+        mock_http.return_value = self.SAMPLE_RESPONSE
 
         result = spotify_track_primary_artist_by_uri("fake-token", duped)
 
         # Still only 3 unique track IDs → 1 batch
         mock_http.assert_called_once()
         self.assertEqual(len(result), 3)
+        # First-seen order is kept in both the request and the result
+        self.assertEqual(list(result), SAMPLE_URIS[::-1])
+        self.assertEqual(
+            _ids_from_url(mock_http.call_args[0][1]),
+            ["CCC333", "BBB222", "AAA111"],
+        )
+
+    @patch("spotify_api.http_json")
+    def test_cache_hits_skip_http(self, mock_http: MagicMock) -> None:
+        """A second lookup of the same tracks is served from the cache."""
+        mock_http.return_value = self.SAMPLE_RESPONSE
+
+        first = spotify_track_primary_artist_by_uri("fake-token", SAMPLE_URIS)
+        mock_http.reset_mock()
+        second = spotify_track_primary_artist_by_uri("fake-token", SAMPLE_URIS)
+
+        mock_http.assert_not_called()
+        self.assertEqual(second, first)
+
+    @patch("spotify_api.http_json")
+    def test_cache_partial_hit_fetches_only_missing(
+        self, mock_http: MagicMock,
+    ) -> None:
+        """Only track IDs missing from the cache are requested."""
+        mock_http.side_effect = _tracks_response_for_url
+        spotify_track_primary_artist_by_uri("fake-token", SAMPLE_URIS[:2])
+        mock_http.reset_mock()
+
+        result = spotify_track_primary_artist_by_uri("fake-token", SAMPLE_URIS)
+
+        mock_http.assert_called_once()
+        self.assertEqual(_ids_from_url(mock_http.call_args[0][1]), ["CCC333"])
+        self.assertEqual(len(result), 3)
+
+    @patch("spotify_api.http_json")
+    def test_coalesces_concurrent_requests(self, mock_http: MagicMock) -> None:
+        """A caller overlapping an in-flight lookup waits instead of refetching."""
+        started = threading.Event()
+        release = threading.Event()
+        attached = threading.Event()
+
+        class _ObservedFuture(Future):
+            # Only a caller waiting on someone else's lookup asks for result()
+            def result(self, timeout: float | None = None) -> object:
+                attached.set()
+                return super().result(timeout)
+
+        def _slow_response(method: str, url: str, **kwargs: object) -> dict:
+            started.set()
+            release.wait(timeout=5)
+            return _tracks_response_for_url(method, url, **kwargs)
+
+        mock_http.side_effect = _slow_response
+        results: dict[str, dict[str, str]] = {}
+
+        def _lookup(name: str, uris: list[str]) -> None:
+            results[name] = spotify_track_primary_artist_by_uri("fake-token", uris)
+
+        first = threading.Thread(target=_lookup, args=("first", SAMPLE_URIS))
+        second = threading.Thread(target=_lookup, args=("second", SAMPLE_URIS[1:]))
+        with patch("spotify_api.Future", _ObservedFuture):
+            first.start()
+            self.assertTrue(started.wait(timeout=5))
+            second.start()
+            # Hold the first lookup until the second is waiting on it
+            self.assertTrue(attached.wait(timeout=5))
+            release.set()
+            first.join(timeout=5)
+            second.join(timeout=5)
+
+        self.assertEqual(mock_http.call_count, 1)
+        self.assertEqual(results["second"]["spotify:track:CCC333"], "aCCC333")
+        self.assertEqual(len(results["first"]), 3)
 
     def test_empty_input(self) -> None:
         """Empty URI list should return empty dict without any API call."""
@@ -191,8 +292,6 @@ class TestSpreadTracksByArtist(unittest.TestCase):
     """Test the _spread_tracks_by_artist helper."""
 
     def test_spreads_adjacent_same_artist(self) -> None:
-        from create_weekly_playlist import _spread_tracks_by_artist
-
         # 3 tracks by artist A, then 3 by artist B
         uris = ["a1", "a2", "a3", "b1", "b2", "b3"]
         artist_map = {
@@ -208,6 +307,22 @@ class TestSpreadTracksByArtist(unittest.TestCase):
                 f"Adjacent same artist at index {i}: {result}",
             )
 
+    def test_spreads_large_skewed_playlist(self) -> None:
+        # 500 tracks over 5 artists, grouped and skewed toward artist A
+        counts = {"A": 200, "B": 120, "C": 80, "D": 60, "E": 40}
+        uris = [f"{artist}{i}" for artist, n in counts.items() for i in range(n)]
+        artist_map = {uri: uri[0] for uri in uris}
+
+        result = _spread_tracks_by_artist(uris, artist_map)
+
+        self.assertEqual(sorted(result), sorted(uris))
+        for i in range(len(result) - 1):
+            self.assertNotEqual(
+                artist_map[result[i]],
+                artist_map[result[i + 1]],
+                f"Adjacent same artist at index {i}",
+            )
+
 
 class TestPrimaryArtistMapFromTracks(unittest.TestCase):
     """Tests for primary_artist_map_from_tracks."""
@@ -282,7 +397,3 @@ class TestSearchTracksWithArtists(unittest.TestCase):
         )
         self.assertEqual(uris, [])
         self.assertEqual(artist_map, {})
-
-
-if __name__ == "__main__":
-    unittest.main()
@@ -0,0 +1,104 @@
+"""Unit tests for spotify_auth token caching — no real Spotify calls."""
+from __future__ import annotations
+
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+import spotify_auth
+from spotify_auth import REQUIRED_SCOPES, spotify_access_token
+
+
+def _token_response(scopes: set[str] = REQUIRED_SCOPES) -> dict:
+    return {
+        "access_token": "fresh-token",
+        "scope": " ".join(sorted(scopes)),
+        "expires_in": 3600,
+    }
+
+
+@patch("spotify_auth.http_json")
+class TestSpotifyAccessTokenCache(unittest.TestCase):
+    """Tests for the on-disk access-token cache in spotify_access_token."""
+
+    def setUp(self) -> None:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_file = Path(tmp_dir.name) / "token.json"
+        cache_patch = patch("spotify_auth.SPOTIFY_TOKEN_CACHE_FILE", self.cache_file)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+    def _write_cache(self, *, expires_at: float) -> None:
+        key = spotify_auth._token_cache_key("client", "refresh")
+        self.cache_file.write_text(json.dumps({
+            key: {
+                "access_token": "cached-token",
+                "scope": " ".join(sorted(REQUIRED_SCOPES)),
+                "expires_at": expires_at,
+            },
+        }))
+
+    def test_cache_hit_skips_refresh(self, mock_http: MagicMock) -> None:
+        mock_http.return_value = _token_response()
+
+        first, _ = spotify_access_token("client", "secret", "refresh")
+        second, granted = spotify_access_token("client", "secret", "refresh")
+
+        self.assertEqual(first, "fresh-token")
+        self.assertEqual(second, "fresh-token")
+        self.assertEqual(granted, REQUIRED_SCOPES)
+        mock_http.assert_called_once()
+
+    def test_entry_inside_expiry_margin_refreshes(self, mock_http: MagicMock) -> None:
+        """A token expiring within the safety margin is not reused."""
+        mock_http.return_value = _token_response()
+        margin = spotify_auth.SPOTIFY_TOKEN_EXPIRY_MARGIN_SECONDS
+        self._write_cache(expires_at=time.time() + margin / 2)
+
+        token, _ = spotify_access_token("client", "secret", "refresh")
+
+        self.assertEqual(token, "fresh-token")
+        mock_http.assert_called_once()
+
+    def test_unexpired_entry_is_reused(self, mock_http: MagicMock) -> None:
+        self._write_cache(expires_at=time.time() + 3600)
+
+        token, _ = spotify_access_token("client", "secret", "refresh")
+
+        self.assertEqual(token, "cached-token")
+        mock_http.assert_not_called()
+
+    def test_missing_scopes_never_cached(self, mock_http: MagicMock) -> None:
+        mock_http.return_value = _token_response({"user-top-read"})
+
+        with self.assertRaises(RuntimeError):
+            spotify_access_token("client", "secret", "refresh")
+
+        self.assertFalse(self.cache_file.exists())
+
+    def test_corrupt_cache_falls_back_to_refresh(self, mock_http: MagicMock) -> None:
+        mock_http.return_value = _token_response()
+        self.cache_file.write_text("{not json")
+
+        token, _ = spotify_access_token("client", "secret", "refresh")
+
+        self.assertEqual(token, "fresh-token")
+        mock_http.assert_called_once()
+        # The broken file is replaced with a readable cache
+        self.assertEqual(len(json.loads(self.cache_file.read_text())), 1)
+
+    @unittest.skipIf(os.name == "nt", "POSIX file modes only")
+    def test_cache_file_is_private(self, mock_http: MagicMock) -> None:
+        mock_http.return_value = _token_response()
+
+        spotify_access_token("client", "secret", "refresh")
+
+        mode = stat.S_IMODE(self.cache_file.stat().st_mode)
+        self.assertEqual(mode, 0o600)
+        self.assertNotIn("refresh", self.cache_file.read_text())